@@ -0,0 +1 @@
+﻿# checks/__init__.py
@@ -0,0 +1,30 @@
+# checks/import_budget.py
+import subprocess
+import sys
+
+# 목록 조회 시 import 시간 예산 (초)
+IMPORT_BUDGET_SEC = 0.3
+HEAVY_MODULES = ("google.genai", "pydantic")
+
+
+def measure() -> tuple[float, list[str]]:
+    """새 프로세스에서 main, graphs import + 그래프 목록 조회 시간과 로드된 무거운 모듈 측정"""
+    code = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        "import main, graphs\n"
+        "graphs.list_graphs()\n"
+        "print(time.perf_counter() - t)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split("\n")
+    return float(out[0]), [m for m in out[1].split(",") if m]
+
+
+# Test: python -m checks.import_budget
+if __name__ == "__main__":
+    elapsed, loaded = measure()
+    print(f"import main, graphs: {elapsed * 1000:.1f}ms (budget {IMPORT_BUDGET_SEC * 1000:.0f}ms)")
+    assert not loaded, f"목록 조회 중 무거운 모듈이 로드되었습니다.: {loaded}"
+    assert elapsed < IMPORT_BUDGET_SEC, "import 시간 예산을 초과했습니다."
+    print("OK")
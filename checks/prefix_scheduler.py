@@ -0,0 +1,126 @@
+# checks/prefix_scheduler.py
+import random
+import threading
+import time
+
+from modules.llm.prefix import PrefixScheduler
+
+TIMEOUT_SEC = 5
+
+
+def _wait_until(cond, timeout: float = TIMEOUT_SEC):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "대기 조건이 시간 안에 충족되지 않았습니다."
+        time.sleep(0.001)
+
+
+def _waiting_count(scheduler: PrefixScheduler) -> int:
+    with scheduler._cond:
+        return sum(len(q) for q in scheduler._waiting.values())
+
+
+def check_release_race():
+    """슬롯 반납 직후 다른 프리픽스 요청이 끼어들어 대기 순서가 바뀌어도 모두 진행되는지 확인
+
+    max_in_flight=1: k0이 슬롯을 잡은 동안 A(k1) 대기 → 반납 → B(k2), C(k2)가 끼어듦.
+    """
+    scheduler = PrefixScheduler(max_in_flight=1)
+    order = []
+
+    def request(name: str, key: str):
+        with scheduler.slot(key):
+            order.append(name)
+
+    release_hook = threading.Event()
+    holder_ready = threading.Event()
+
+    def holder():
+        with scheduler.slot("k0"):
+            holder_ready.set()
+            release_hook.wait(TIMEOUT_SEC)
+
+    threads = [threading.Thread(daemon=True, target=holder)]
+    threads[0].start()
+    holder_ready.wait(TIMEOUT_SEC)
+
+    threads.append(threading.Thread(daemon=True, target=request, args=("A", "k1")))
+    threads[-1].start()
+    _wait_until(lambda: _waiting_count(scheduler) == 1)
+
+    # 반납과 B, C 등록을 같은 락 구간에서 일어나게 해서 리뷰에서 재현된 순서를 강제
+    with scheduler._cond:
+        release_hook.set()
+        for name in ("B", "C"):
+            t = threading.Thread(daemon=True, target=request, args=(name, "k2"))
+            threads.append(t)
+            t.start()
+        time.sleep(0.05)  # holder가 반납 대기, B/C가 락 대기 상태가 되도록
+
+    for t in threads:
+        t.join(TIMEOUT_SEC)
+        assert not t.is_alive(), f"교착 상태: in_flight={scheduler._in_flight}, waiting={scheduler._waiting}"
+    assert sorted(order) == ["A", "B", "C"], order
+    assert scheduler._in_flight == 0 and not scheduler._waiting
+
+
+def check_stress(n_threads: int = 64, n_keys: int = 4, max_in_flight: int = 3):
+    """여러 프리픽스 요청이 무작위로 몰려도 동시 호출 수 제한을 지키고 모두 끝나는지 확인"""
+    scheduler = PrefixScheduler(max_in_flight=max_in_flight, max_burst=4)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def request(key: str):
+        time.sleep(random.random() * 0.01)
+        with scheduler.slot(key):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(random.random() * 0.005)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(daemon=True, target=request, args=(f"k{i % n_keys}",)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(TIMEOUT_SEC)
+        assert not t.is_alive(), f"교착 상태: in_flight={scheduler._in_flight}, waiting={scheduler._waiting}"
+    assert peak[0] <= max_in_flight, peak[0]
+    assert scheduler._in_flight == 0 and not scheduler._waiting
+
+
+def check_grouping():
+    """대기 중인 요청은 같은 프리픽스끼리 이어서 나가는지 확인"""
+    scheduler = PrefixScheduler(max_in_flight=1)
+    order = []
+    gate = threading.Event()
+
+    def holder():
+        with scheduler.slot("h"):
+            gate.wait(TIMEOUT_SEC)
+
+    def request(key: str):
+        with scheduler.slot(key):
+            order.append(key)
+
+    threads = [threading.Thread(daemon=True, target=holder)]
+    threads[0].start()
+    _wait_until(lambda: scheduler._in_flight == 1)
+    for i, key in enumerate(["a", "b", "a", "b", "a", "b"]):
+        threads.append(threading.Thread(daemon=True, target=request, args=(key,)))
+        threads[-1].start()
+        _wait_until(lambda: _waiting_count(scheduler) == i + 1)
+    gate.set()
+    for t in threads:
+        t.join(TIMEOUT_SEC)
+    assert order in (["a"] * 3 + ["b"] * 3, ["b"] * 3 + ["a"] * 3), order
+
+
+# Test: python -m checks.prefix_scheduler
+if __name__ == "__main__":
+    for _ in range(20):
+        check_release_race()
+    check_stress()
+    check_grouping()
+    print("OK")
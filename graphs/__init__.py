@@ -1,3 +1,29 @@
 ﻿# graphs/__init__.py
-from .test import create_test_graph
-from .debate.factory import create_debate_graph
+from .registry import (
+    GRAPH_FACTORIES,
+    CONTEXT_FACTORIES,
+    UnknownGraphError,
+    register_graph,
+    list_graphs,
+    get_graph_factory,
+    get_context_factory,
+    graph_params,
+    required_params,
+    create_graph,
+    create_context,
+    build_graph,
+    run_graph,
+)
+import importlib
+
+# 팩토리는 처음 접근할 때 import (google.genai, pydantic 로딩 지연)
+_LAZY_FACTORIES = {
+    "create_test_graph": "graphs.test",
+    "create_debate_graph": "graphs.debate.factory",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_FACTORIES:
+        return getattr(importlib.import_module(_LAZY_FACTORIES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
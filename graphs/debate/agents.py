@@ -4,6 +4,7 @@ from modules.agent import Agent  # 베이스 에이전트 클래스
 from modules.llm.client import Client
 from pydantic import BaseModel
 from modules.context import Context
+from modules.trace.hooks import span
 
 class BullReply(BaseModel):
     """Bull 에이전트의 응답 스키마 - 매수 주장"""
@@ -41,6 +42,13 @@ COMMON_CONTEXT_TMPL = """[MARKET REPORT]
 {last_arg}
 """
 
+
+def _report(context: Context, key: str) -> str:
+    """use_digest면 리포트 요약을, 요약이 없거나 비활성이면 원문을 반환"""
+    if context.get_cache("use_digest", False) and f"{key}_digest" in context.reports:
+        return context.get_report(f"{key}_digest")
+    return context.get_report(key)
+
 # BullResearcher
 class BullResearcher(Agent):
     """주식 매수를 옹호하는 Bull 에이전트 (낙관적 관점)"""
@@ -55,27 +63,29 @@ class BullResearcher(Agent):
         history = context.get_cache("history", "")  # 전체 토론 히스토리
         last_arg = context.get_cache("current_response", "")  # 상대방의 마지막 주장
         # AI에게 전달할 프롬프트 구성
-        prompt = COMMON_CONTEXT_TMPL.format(  # 공통 템플릿에 데이터 삽입
-            market_report=context.get_report("market_report"),  # 시장 리포트
-            sentiment_report=context.get_report("sentiment_report"),  # 감정 분석
-            news_report=context.get_report("news_report"),  # 뉴스 정보
-            fundamentals_report=context.get_report("fundamentals_report"),  # 펀더멘털 분석
-            history=history,  # 토론 히스토리
-            last_arg=last_arg,  # 상대방의 마지막 주장
-        )
-
-        # 메시지 리스트 구성
-        contents = [
+        with span("build_prompt", agent=self.name):  # 타임라인 트레이스용 구간
+            prompt = COMMON_CONTEXT_TMPL.format(  # 공통 템플릿에 데이터 삽입
+                market_report=_report(context, "market_report"),  # 시장 리포트
+                sentiment_report=_report(context, "sentiment_report"),  # 감정 분석
+                news_report=_report(context, "news_report"),  # 뉴스 정보
+                fundamentals_report=_report(context, "fundamentals_report"),  # 펀더멘털 분석
+                history=history,  # 토론 히스토리
+                last_arg=last_arg,  # 상대방의 마지막 주장
+            )
+
+        # 메시지 리스트 구성 (고정 지시문을 앞에 두어 모든 티커/턴에서 같은 프리픽스 사용)
+        prefix = [
             f"You are {self.name}, a Bull Analyst advocating for investing in the stock.",
             "Debate concisely with strong evidence.",
-            prompt,
             "Return JSON with field: chat (your argument).",
         ]
+        contents = [prompt]  # 티커/턴마다 바뀌는 부분
 
         # AI 호출
         resp = self.llm_client.generate_content(  # 콘텐츠 생성 요청
             model=self.quick_model,  # gemini-2.5-flash
             contents=contents,  # 위에서 만든 메시지 리스트
+            prefix=prefix,  # 고정 지시문 (contents 앞에 붙음)
             thinking_budget=self.quick_thinking_budget,  # 사고 시간
             schema=BullReply,  # 구조화된 출력 스키마
         )
@@ -114,27 +124,29 @@ class BearResearcher(Agent):
         last_arg = context.get_cache("current_response", "")  # 상대방의 마지막 주장
 
         # AI에게 전달할 프롬프트 구성
-        prompt = COMMON_CONTEXT_TMPL.format(  # 공통 템플릿에 데이터 삽입
-            market_report=context.get_report("market_report"),  # 시장 리포트
-            sentiment_report=context.get_report("sentiment_report"),  # 감정 분석
-            news_report=context.get_report("news_report"),  # 뉴스 정보
-            fundamentals_report=context.get_report("fundamentals_report"),  # 펀더멘털 분석
-            history=history,  # 토론 히스토리
-            last_arg=last_arg,  # 상대방의 마지막 주장
-        )
-
-        # AI에게 전달할 메시지 리스트 구성
-        contents = [
+        with span("build_prompt", agent=self.name):  # 타임라인 트레이스용 구간
+            prompt = COMMON_CONTEXT_TMPL.format(  # 공통 템플릿에 데이터 삽입
+                market_report=_report(context, "market_report"),  # 시장 리포트
+                sentiment_report=_report(context, "sentiment_report"),  # 감정 분석
+                news_report=_report(context, "news_report"),  # 뉴스 정보
+                fundamentals_report=_report(context, "fundamentals_report"),  # 펀더멘털 분석
+                history=history,  # 토론 히스토리
+                last_arg=last_arg,  # 상대방의 마지막 주장
+            )
+
+        # AI에게 전달할 메시지 리스트 구성 (고정 지시문을 앞에 두어 모든 티커/턴에서 같은 프리픽스 사용)
+        prefix = [
             f"You are {self.name}, a Bear Analyst emphasizing risks and downsides.",
             "Debate concisely with strong evidence.",
-            prompt, 
             "Return JSON with field: chat (your argument).",
         ]
+        contents = [prompt]  # 티커/턴마다 바뀌는 부분
 
         # AI 호출
         resp = self.llm_client.generate_content(  # 콘텐츠 생성 요청
             model=self.quick_model,  # gemini-2.5-flash
             contents=contents,  # 메시지 리스트
+            prefix=prefix,  # 고정 지시문 (contents 앞에 붙음)
             thinking_budget=self.quick_thinking_budget,  # 사고 시간
             schema=BearReply,  # 구조화된 출력 스키마
         )
@@ -173,21 +185,22 @@ class ResearchManager(Agent):
         history = context.get_cache("history", "")  # Bull과 Bear의 전체 토론 내용
 
         # AI에게 전달할 프롬프트 구성
-        prompt = f"""As the portfolio manager ({self.name}), read the debate below and output a clear decision.
-
-Debate:
-{history}
+        instructions = f"""As the portfolio manager ({self.name}), read the debate below and output a clear decision.
 
 Return JSON with:
 - decision: "BUY"|"SELL"|"HOLD"
 - rationale: concise reasoning
 - plan: concrete next steps
-"""  # 매니저의 역할과 출력 형식을 명확히 지시
+"""  # 매니저의 역할과 출력 형식을 명확히 지시 (모든 티커에서 같은 프리픽스)
+        prompt = f"""Debate:
+{history}
+"""  # 티커마다 바뀌는 부분
 
         # AI 호출
         resp = self.llm_client.generate_content(
             model=self.quick_model,
             contents=[prompt],  # 프롬프트 전달
+            prefix=[instructions],  # 고정 지시문 (contents 앞에 붙음)
             thinking_budget=self.quick_thinking_budget,  # 사고 시간
             schema=ManagerDecision,  # 구조화된 출력 스키마
         )
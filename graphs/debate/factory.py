@@ -4,6 +4,7 @@ from pathlib import Path
 from modules.graph.graph import Graph
 from graphs.debate.nodes import BullNode, BearNode, ManagerNode
 from modules.context import Context
+from modules.report.digest import get_digest, render_digest
 
 # 유틸리티 함수들
 def _primary_report_path(ticker: str, trade_date: str) -> Path:
@@ -24,6 +25,17 @@ def _resolve_report_path(ticker: str, trade_date: str) -> Path:
 def _read(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
+def _set_report(ctx: Context, key: str, path: Path, use_digest: bool):
+    """원문과 (use_digest면) 요약을 함께 Context에 저장"""
+    text = _read(path)
+    ctx.set_report(key, text)  # 원문은 항상 저장 (요약 실패/비활성 시 사용)
+    if not use_digest:
+        return
+    try:
+        ctx.set_report(f"{key}_digest", render_digest(get_digest(path, text)))  # 리포트 버전별로 한 번만 생성
+    except Exception as e:  # 요약 실패 시 원문 사용
+        print(f"[digest][{key}]", e)
+
 
 # 조건 함수들
 def under_round_limit(context: Context, max_rounds: int) -> bool:
@@ -33,7 +45,8 @@ def reached_round_limit(context: Context, max_rounds: int) -> bool:
     """토론 라운드가 제한에 도달했는지 확인"""
     return not under_round_limit(context, max_rounds)
 
-def create_debate_graph(ticker: str, trade_date: str, rounds: int = 1):
+def build_debate_graph(rounds: int = 1) -> Graph:
+    """Bull ↔ Bear 토론 후 Manager가 결정하는 그래프 (티커/날짜와 무관하므로 재사용 가능)"""
     # 1. 노드 생성
     bull = BullNode("Bull")  # Bull 노드 생성
     bear = BearNode("Bear")  # Bear 노드 생성
@@ -55,15 +68,23 @@ def create_debate_graph(ticker: str, trade_date: str, rounds: int = 1):
     )
     g.add_edge("Bear", "Bull")  # 위 조건이 False면 Bull로
 
-    # 4. 마켓 리포트 파일 읽기
+    return g
+
+
+def create_debate_context(ticker: str, trade_date: str, rounds: int = 1, use_digest: bool = False) -> Context:
+    """(ticker, trade_date)의 리포트를 읽어 토론용 Context 생성
+
+    use_digest=True면 프롬프트에 리포트 원문 대신 요약(<리포트>.digest.json)을 사용한다 (기본: 원문).
+    """
+    # 1. 마켓 리포트 파일 읽기
     rp = _resolve_report_path(ticker, trade_date)  # 마켓 리포트 파일 경로 찾기
     reports_dir = rp.parent  # 리포트 디렉토리 경로
 
-    # 5. Context 초기화
+    # 2. Context 초기화
     ctx = Context()  # 빈 Context 생성
 
     # 리포트 데이터 저장 (Context.reports에 저장)
-    ctx.set_report("market_report", _read(rp))  # 마켓 리포트 읽어서 저장
+    _set_report(ctx, "market_report", rp, use_digest)  # 마켓 리포트 (+ 요약) 읽어서 저장
     # ctx.set_report("sentiment_report", "(auto) none")  # 감정 분석
     # ctx.set_report("news_report", "(auto) none")  # 뉴스 리포트
     # ctx.set_report("fundamentals_report", "(auto) none")  # 펀더멘털 분석
@@ -80,7 +101,13 @@ def create_debate_graph(ticker: str, trade_date: str, rounds: int = 1):
         current_response="",  # 가장 최근 발언
         count=0,  # 토론 카운트
         max_rounds=rounds,  # 최대 라운드 수
+        use_digest=use_digest,  # 리포트 요약 사용 여부
     )
 
-    # 6. 그래프와 Context 반환
+    return ctx
+
+
+def create_debate_graph(ticker: str, trade_date: str, rounds: int = 1, use_digest: bool = False):
+    g = build_debate_graph(rounds)  # 그래프 생성
+    ctx = create_debate_context(ticker, trade_date, rounds, use_digest)  # Context 생성
     return g, ctx  # (Graph, Context) 튜플 반환
@@ -7,14 +7,16 @@ import json
 from modules.graph.node import BaseNode
 from graphs.debate.agents import BullResearcher, BearResearcher, ResearchManager
 from modules.context import Context
+from modules.trace.hooks import span
 
 LOG_DIR = Path("logs/research_dialogs")  # 토론 로그가 저장될 디렉토리
 RESULTS_DIR = Path("results")  # 최종 결과가 저장될 디렉토리
 
 # 유틸리티 함수
 def _write_json(path: Path, payload: dict):  # JSON 파일을 저장하는 헬퍼 함수
-    path.parent.mkdir(parents=True, exist_ok=True)  # 부모 디렉토리가 없으면 생성
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")  # JSON 저장
+    with span("write_json", path=str(path)):  # 타임라인 트레이스용 구간
+        path.parent.mkdir(parents=True, exist_ok=True)  # 부모 디렉토리가 없으면 생성
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")  # JSON 저장
 
 def _round_dir(context: Context) -> Path:  # 로그 디렉토리 경로를 생성하는 함수
     tkr = context.get_cache("ticker", "UNKNOWN")  # 티커 심볼
@@ -135,7 +137,8 @@ class ManagerNode(BaseNode):
             ]
 
             # 마크다운 파일 저장 (investment_plan.md)
-            (reports_dir / "investment_plan.md").write_text("\n".join(md), encoding="utf-8")  # results/GOOGL/2025-03-28/reports/investment_plan.md
+            with span("write_plan", path=str(reports_dir / "investment_plan.md")):  # 타임라인 트레이스용 구간
+                (reports_dir / "investment_plan.md").write_text("\n".join(md), encoding="utf-8")  # results/GOOGL/2025-03-28/reports/investment_plan.md
 
         except Exception as e:  # 마크다운 저장 실패 시
             print("[ManagerNode][save plan]", e)  # 에러 메시지 출력
@@ -0,0 +1,109 @@
+# graphs/registry.py
+import importlib
+import inspect
+
+from modules.context import Context
+from modules.graph.graph import Graph
+
+# 그래프 이름 → "모듈:팩토리 함수" 경로
+# 실제 import는 해당 그래프를 사용할 때만 일어나므로, 목록 조회는 google.genai/pydantic을 불러오지 않음
+GRAPH_FACTORIES: dict[str, str] = {
+    "debate": "graphs.debate.factory:build_debate_graph",
+    "test": "graphs.test:create_test_graph",
+}
+
+# 그래프 이름 → Context 팩토리 경로 (없으면 빈 Context 사용)
+CONTEXT_FACTORIES: dict[str, str] = {
+    "debate": "graphs.debate.factory:create_debate_context",
+}
+
+
+class UnknownGraphError(KeyError):
+    """등록되지 않은 그래프 이름"""
+
+
+def _check_target(target: str):
+    if ":" not in target:
+        raise ValueError(f"팩토리 경로는 'module:function' 형식이어야 합니다.: {target}")
+
+
+def _load(target: str):
+    module_name, func_name = target.split(":", 1)
+    module = importlib.import_module(module_name)  # 이 시점에 처음으로 무거운 모듈을 불러옴
+    return getattr(module, func_name)
+
+
+def _accepted(func, params: dict) -> dict:
+    accepted = inspect.signature(func).parameters
+    return {k: v for k, v in params.items() if k in accepted}
+
+
+def register_graph(name: str, target: str, context_target: str = None):
+    """'패키지.모듈:함수' 형식의 그래프 (및 Context) 팩토리를 이름으로 등록"""
+    _check_target(target)
+    GRAPH_FACTORIES[name] = target
+    if context_target is not None:
+        _check_target(context_target)
+        CONTEXT_FACTORIES[name] = context_target
+
+
+def list_graphs() -> list[str]:
+    return sorted(GRAPH_FACTORIES)
+
+
+def get_graph_factory(name: str):
+    target = GRAPH_FACTORIES.get(name)
+    if target is None:
+        raise UnknownGraphError(f"등록되지 않은 그래프입니다.: '{name}' (가능: {', '.join(list_graphs())})")
+    return _load(target)
+
+
+def get_context_factory(name: str):
+    target = CONTEXT_FACTORIES.get(name)
+    return _load(target) if target else None
+
+
+def graph_params(name: str, params: dict) -> dict:
+    """params 중 그래프 구조를 결정하는 인자만 추출 (같은 값이면 그래프를 재사용할 수 있음)"""
+    return _accepted(get_graph_factory(name), params)
+
+
+def required_params(name: str) -> set[str]:
+    """그래프/Context 팩토리가 기본값 없이 요구하는 인자 이름"""
+    required = set()
+    for factory in (get_graph_factory(name), get_context_factory(name)):
+        if factory is None:
+            continue
+        for param in inspect.signature(factory).parameters.values():
+            if param.default is inspect.Parameter.empty and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                required.add(param.name)
+    return required
+
+
+def create_graph(name: str, **params) -> Graph:
+    factory = get_graph_factory(name)
+    return factory(**_accepted(factory, params))
+
+
+def create_context(name: str, **params) -> Context:
+    """Context 팩토리가 받는 인자는 팩토리에 넘기고, 나머지는 Context 캐시에 저장"""
+    factory = get_context_factory(name)
+    if factory is None:
+        context, used = Context(), {}
+    else:
+        used = _accepted(factory, params)
+        context = factory(**used)
+
+    skip = used.keys() | graph_params(name, params).keys()
+    context.set_cache(**{k: v for k, v in params.items() if k not in skip})
+    return context
+
+
+def build_graph(name: str, **params) -> tuple[Graph, Context]:
+    """이름으로 그래프와 Context를 생성"""
+    return create_graph(name, **params), create_context(name, **params)
+
+
+def run_graph(name: str, **params) -> Context:
+    graph, context = build_graph(name, **params)
+    return graph.run(context)
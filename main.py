@@ -1,11 +1,218 @@
 ﻿# main.py
-from graphs.debate.factory import create_debate_graph
+import argparse
+from contextlib import nullcontext
+from itertools import product
 
-if __name__ == "__main__":
-    graph, ctx = create_debate_graph(
-        ticker="GOOGL",
-        trade_date="2025-03-28",
-        rounds=2
-    )
+from graphs.registry import list_graphs, required_params, run_graph
+
+# --set으로 받을 때 정수로 변환하는 파라미터 (나머지는 문자열 그대로, 예: ticker=0700)
+INT_PARAMS = {"rounds", "max_rounds", "max_chats"}
+
+
+def _parse_param(pair: str) -> tuple[str, object]:
+    """--set key=value 하나를 (key, value)로 변환 (INT_PARAMS에 있는 키만 int로 저장)"""
+    if "=" not in pair:
+        raise argparse.ArgumentTypeError(f"key=value 형식이 아닙니다.: {pair}")
+    key, value = pair.split("=", 1)
+    if key in INT_PARAMS:
+        try:
+            value = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"{key}는 정수여야 합니다.: {value}")
+    return key, value
+
+
+def _job_params(args, ticker: str = None, trade_date: str = None) -> dict:
+    params = dict(args.set)
+    if ticker:
+        params["ticker"] = ticker
+    if trade_date:
+        params["trade_date"] = trade_date
+    if args.rounds is not None:
+        params["rounds"] = args.rounds
+    if args.digest:
+        params["use_digest"] = True
+    return params
+
+
+def _tracer(args):
+    """--trace가 주어지면 실행 동안 Chrome trace-event 타임라인을 기록"""
+    if not args.trace:
+        return nullcontext()
+    from modules.trace import ChromeTracer
+
+    return ChromeTracer(args.trace, memory=args.trace_memory)
+
+
+def _print_prefix_stats(stats: dict):
+    """LLM 호출의 프리픽스 hit율(직전 호출과 같은 프리픽스)과 제공자 캐시 토큰 비율 출력"""
+    if not stats["requests"]:
+        return
+    print(f"[prefix] calls={stats['requests']} prefix_hit_rate={stats['prefix_hit_rate']:.1%} "
+          f"cached_tokens={stats['cached_tokens']}/{stats['prompt_tokens']} ({stats['cached_token_rate']:.1%})")
+
+
+def cmd_list(args):
+    for name in list_graphs():
+        print(name)
+
+
+# 필수 파라미터 → 해당 CLI 옵션 (오류 메시지용)
+_PARAM_OPTIONS = {"ticker": "--ticker", "trade_date": "--date"}
+
+
+def cmd_run(args):
+    params = _job_params(args, args.ticker, args.date)
+    missing = required_params(args.graph) - params.keys()
+    if missing:
+        options = ", ".join(sorted(_PARAM_OPTIONS.get(p, f"--set {p}=...") for p in missing))
+        args.parser.error(f"'{args.graph}' 그래프에 필요한 인자가 없습니다.: {options}")
+    with _tracer(args):
+        context = run_graph(args.graph, **params)
+    print(context.get_cache("current_response", ""))
+
+    from modules.llm import prefix_stats
+    _print_prefix_stats(prefix_stats())
+
+
+def cmd_batch(args):
+    """여러 티커/날짜를 메모리 작업 큐에 넣고 워커 스레드로 처리
+
+    모든 작업이 한 프로세스의 LLM 클라이언트를 공유하므로, --max-llm-calls를 주면 대기 중인 LLM 요청이 프리픽스별로 묶여서 전송된다.
+    """
+    from modules.llm import prefix_stats, set_max_in_flight
+    from modules.worker import JobQueue, Worker
+
+    set_max_in_flight(args.max_llm_calls)
+    queue = JobQueue(":memory:")
+    params = _job_params(args)
+    for ticker, trade_date in product(args.tickers.split(","), args.dates.split(",")):
+        queue.enqueue(args.graph, ticker, trade_date, params, max_attempts=args.max_attempts)
+
+    with _tracer(args):
+        Worker(queue, concurrency=args.workers, poll_interval=0.1, retry_delay=args.retry_delay).run(until_empty=True)
+    failed = queue.counts().get("failed", 0)
+    queue.close()
+
+    _print_prefix_stats(prefix_stats())
+    return 1 if failed else 0
 
-    graph.run(ctx)
\ No newline at end of file
+
+def cmd_enqueue(args):
+    from modules.worker import JobQueue
+
+    queue = JobQueue(args.db)
+    params = _job_params(args)
+    for ticker, trade_date in product(args.tickers.split(","), args.dates.split(",")):
+        job_id = queue.enqueue(args.graph, ticker, trade_date, params, max_attempts=args.max_attempts)
+        print(f"[queued] #{job_id} {args.graph} {ticker} {trade_date}")
+    queue.close()
+
+
+def cmd_worker(args):
+    from modules.llm import prefix_stats, set_max_in_flight
+    from modules.worker import JobQueue, Worker, WorkerLockedError
+
+    set_max_in_flight(args.max_llm_calls)  # 제한을 주면 대기 중인 LLM 요청을 프리픽스별로 묶어서 보냄
+    queue = JobQueue(args.db)
+    try:
+        with _tracer(args):
+            Worker(queue, concurrency=args.concurrency, poll_interval=args.poll, retry_delay=args.retry_delay).run()
+    except WorkerLockedError as e:
+        print(f"[Worker] {e}")
+        return 1
+    finally:
+        queue.close()
+    _print_prefix_stats(prefix_stats())
+
+
+def cmd_jobs(args):
+    from modules.worker import JobQueue
+
+    queue = JobQueue(args.db)
+    if args.id is None:
+        for status, n in sorted(queue.counts().items()):
+            print(f"{status}: {n}")
+    else:
+        job = queue.get(args.id)
+        if job is None:
+            print(f"job #{args.id} 없음")
+            return 1
+        print(f"#{job['id']} {job['graph']} {job['ticker']} {job['trade_date']} "
+              f"status={job['status']} attempts={job['attempts']}/{job['max_attempts']}")
+        print(job["error"] if job["status"] == "failed" else job["result"] or "")
+    queue.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="Multi-Trading-Agents 그래프 실행기")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list", help="등록된 그래프 목록")
+    p_list.set_defaults(func=cmd_list)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("graph", choices=list_graphs(), help="그래프 이름")
+    common.add_argument("--rounds", type=int, default=None, help="토론 라운드 수")
+    common.add_argument("--digest", action="store_true",
+                        help="리포트 원문 대신 LLM 요약(<리포트>.digest.json, 리포트 버전별 1회 생성)을 프롬프트에 사용")
+    common.add_argument("--set", action="append", default=[], type=_parse_param, metavar="KEY=VALUE", help="추가 파라미터 (반복 가능)")
+
+    trace = argparse.ArgumentParser(add_help=False)
+    trace.add_argument("--trace", default=None, metavar="PATH", help="Chrome trace-event JSON 타임라인 저장 경로")
+    trace.add_argument("--trace-memory", action="store_true", help="노드별 tracemalloc 메모리 증가량도 기록")
+
+    p_run = sub.add_parser("run", parents=[common, trace], help="그래프 1회 실행")
+    p_run.add_argument("--ticker", default=None)
+    p_run.add_argument("--date", default=None, help="거래 날짜 (YYYY-MM-DD)")
+    p_run.set_defaults(func=cmd_run, parser=p_run)
+
+    p_batch = sub.add_parser("batch", parents=[common, trace], help="여러 티커/날짜를 워커 스레드로 한 번에 실행")
+    p_batch.add_argument("--tickers", required=True, help="쉼표로 구분 (예: GOOGL,AAPL)")
+    p_batch.add_argument("--dates", required=True, help="쉼표로 구분 (예: 2025-03-27,2025-03-28)")
+    p_batch.add_argument("--workers", type=int, default=8, help="동시에 처리할 작업 수")
+    p_batch.add_argument("--max-llm-calls", type=int, default=None,
+                         help="동시 LLM 호출 수 제한. 대기 요청은 같은 프리픽스끼리 이어서 전송 "
+                              "(기본: 제한 없음 - 이 경우 프리픽스 묶음도 일어나지 않음)")
+    p_batch.add_argument("--max-attempts", type=int, default=1, help="실패 시 최대 시도 횟수")
+    p_batch.add_argument("--retry-delay", type=float, default=30.0, help="첫 재시도 대기 시간 (초, 시도마다 2배)")
+    p_batch.set_defaults(func=cmd_batch)
+
+    db = argparse.ArgumentParser(add_help=False)
+    db.add_argument("--db", default="jobs/queue.db", help="작업 큐 SQLite 파일")
+
+    p_enqueue = sub.add_parser("enqueue", parents=[common, db], help="작업 큐에 티커/날짜 작업 추가")
+    p_enqueue.add_argument("--tickers", required=True, help="쉼표로 구분 (예: GOOGL,AAPL)")
+    p_enqueue.add_argument("--dates", required=True, help="쉼표로 구분 (예: 2025-03-27,2025-03-28)")
+    p_enqueue.add_argument("--max-attempts", type=int, default=3, help="실패 시 최대 시도 횟수")
+    p_enqueue.set_defaults(func=cmd_enqueue)
+
+    p_worker = sub.add_parser("worker", parents=[db, trace], help="작업 큐를 처리하는 상주 워커 실행 (Ctrl+C: drain, 한 번 더: 즉시 종료)")
+    p_worker.add_argument("--concurrency", type=int, default=4, help="동시에 처리할 작업 수")
+    p_worker.add_argument("--max-llm-calls", type=int, default=None,
+                          help="동시 LLM 호출 수 제한. 대기 요청은 같은 프리픽스끼리 이어서 전송 "
+                               "(기본: 제한 없음 - 이 경우 프리픽스 묶음도 일어나지 않음)")
+    p_worker.add_argument("--retry-delay", type=float, default=30.0, help="첫 재시도 대기 시간 (초, 시도마다 2배)")
+    p_worker.add_argument("--poll", type=float, default=1.0, help="빈 큐 확인 간격 (초)")
+    p_worker.set_defaults(func=cmd_worker)
+
+    p_jobs = sub.add_parser("jobs", parents=[db], help="작업 큐 상태 조회")
+    p_jobs.add_argument("id", type=int, nargs="?", default=None, help="작업 번호 (생략 시 상태별 개수)")
+    p_jobs.set_defaults(func=cmd_jobs)
+
+    return parser
+
+
+# Usage:
+#   python main.py list
+#   python main.py run debate --ticker GOOGL --date 2025-03-28 --rounds 2
+#   python main.py run test --set "subject=어둠의 숲 가설" --set max_chats=10
+#   python main.py run debate --ticker GOOGL --date 2025-03-28 --trace logs/traces/GOOGL.json --trace-memory
+#   python main.py batch debate --tickers GOOGL,AAPL --dates 2025-03-28 --workers 8
+#   python main.py enqueue debate --tickers GOOGL,AAPL --dates 2025-03-28 --rounds 2 --digest
+#   python main.py worker --concurrency 8
+#   python main.py worker --concurrency 8 --max-llm-calls 4   (LLM 호출 제한 + 프리픽스 묶음)
+#   python main.py jobs
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    raise SystemExit(args.func(args) or 0)
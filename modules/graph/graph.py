@@ -1,18 +1,27 @@
 ﻿# modules/graph/graph.py
 from .node import *
 from modules.context import Context
+from modules.trace.hooks import Hook, get_hooks
 
 class Graph:
     def __init__(self, start_node: BaseNode):
         self.start_node = start_node
         self.graph: dict[str, BaseNode] = {start_node.name: start_node}
+        self.hooks: list[Hook] = []
 
     def run(self, context: Context) -> dict:
         current_node = self.start_node
 
         while True:
             current_node.state = 'running'
-            context = current_node.run(context)
+            hooks = get_hooks(self.hooks, current_node.hooks)
+            for hook in hooks:
+                hook.before_node(current_node, context)
+            try:
+                context = current_node.run(context)
+            finally:  # 노드가 실패해도 타임라인 구간은 닫음
+                for hook in hooks:
+                    hook.after_node(current_node, context)
             if current_node.state != 'passed':
                 continue
 
@@ -24,6 +33,10 @@ class Graph:
 
         return context
 
+    def add_hook(self, hook: Hook):
+        """이 그래프의 모든 노드 실행 전후에 호출될 훅 등록"""
+        self.hooks.append(hook)
+
     def add_node(self, node: BaseNode) -> str:
         self.graph[node.name] = node
         return node.name
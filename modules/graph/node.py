@@ -1,5 +1,6 @@
 ﻿# modules/graph/node.py
 from modules.context import Context
+from modules.trace.hooks import Hook
 
 
 class Edge:
@@ -17,6 +18,7 @@ class BaseNode:
         self.name = name
         self.state = 'pending'  # 가능한 상태: 'pending', 'running', 'passed'
         self.edges: list[Edge] = []
+        self.hooks: list[Hook] = []  # 이 노드 실행 전후에만 호출될 훅
 
     def run(self, context: Context):
         raise NotImplementedError("BaseNode의 run 메서드는 서브클래스에서 구현되어야 함")
@@ -28,4 +30,7 @@ class BaseNode:
         return None
 
     def add_edge(self, edge: Edge):
-        self.edges.append(edge)
\ No newline at end of file
+        self.edges.append(edge)
+
+    def add_hook(self, hook: Hook):
+        self.hooks.append(hook)
\ No newline at end of file
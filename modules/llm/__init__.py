@@ -1,2 +1,2 @@
 ﻿# modules/llm/__init__.py
-from .client import Client
\ No newline at end of file
+from .client import Client, set_max_in_flight, prefix_stats, reset_prefix_stats
\ No newline at end of file
@@ -1,8 +1,42 @@
 ﻿# modules/llm/client.py
-import google.genai as genai
-from google.genai import types
 from pydantic import BaseModel
+from contextlib import nullcontext
 import json
+import threading
+
+from modules.trace.hooks import Hook, get_hooks, span
+from .prefix import PrefixScheduler, PrefixStats, prefix_key
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+_prefix_stats = PrefixStats()  # 프로세스 전체 프리픽스 통계
+_scheduler: PrefixScheduler | None = None  # None이면 호출을 제한/정렬하지 않음
+
+
+def _get_shared_client():
+    """프로세스 전체에서 하나의 genai.Client를 재사용 (커넥션 풀 유지)"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            import google.genai as genai  # 무거운 SDK는 실제 클라이언트 생성 시점에 로드
+
+            _shared_client = genai.Client()
+        return _shared_client
+
+
+def set_max_in_flight(n: int | None):
+    """동시 API 호출 수를 n으로 제한하고 대기 요청을 프리픽스별로 묶어서 보냄 (None이면 해제)"""
+    global _scheduler
+    _scheduler = PrefixScheduler(n) if n else None
+
+
+def prefix_stats() -> dict:
+    return _prefix_stats.snapshot()
+
+
+def reset_prefix_stats():
+    _prefix_stats.reset()
 
 class Response:
     def __init__(
@@ -11,15 +45,21 @@ class Response:
             content: dict,
             input_tokens: int,
             output_tokens: int,
+            cached_tokens: int = 0,
     ):
         self.model = model
         self.content = content
         self.input_tokens = input_tokens
         self.output_tokens = output_tokens
+        self.cached_tokens = cached_tokens  # 입력 중 제공자 캐시로 처리된 토큰 수
 
 class Client:
     def __init__(self):
-        self.client = genai.Client()
+        self.client = _get_shared_client()
+        self.hooks: list[Hook] = []  # 이 클라이언트의 호출 전후에만 호출될 훅
+
+    def add_hook(self, hook: Hook):
+        self.hooks.append(hook)
 
     def _check_schema(self, schema: BaseModel, content: str) -> bool:
         try:
@@ -35,7 +75,52 @@ class Client:
                 system_instructions: str = None,
                 thinking_budget: int = -1,
                 schema: BaseModel = None,
+                prefix: list = None,
         ) -> Response:
+        """prefix: 요청마다 바뀌지 않는 지시문. 항상 contents 앞에 그대로 붙여서 제공자 측 prefix cache에 맞게 함"""
+        prefix = list(prefix or [])
+        contents = prefix + list(contents)
+        key = prefix_key(model, system_instructions, schema, prefix)
+
+        hooks = get_hooks(self.hooks)
+        for hook in hooks:
+            hook.before_llm(self, model, contents)
+
+        data = None
+        try:
+            data = self._generate_content(model, contents, system_instructions, thinking_budget, schema, hooks, key)
+        finally:  # 실패한 호출도 타임라인 구간은 닫음 (response=None)
+            for hook in hooks:
+                hook.after_llm(self, model, data)
+        return data
+
+    def _call(self, model: str, contents: list, config, key: str, **span_args):
+        """API 1회 호출 (프리픽스 스케줄링 + 통계 기록)"""
+        scheduler = _scheduler
+        with scheduler.slot(key) if scheduler else nullcontext():
+            _prefix_stats.record_dispatch(key)
+            with span("genai.generate_content", model=model, **span_args):
+                response = self.client.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=config
+                )
+
+        usage = response.usage_metadata
+        _prefix_stats.record_usage(usage.prompt_token_count, usage.cached_content_token_count)
+        return response
+
+    def _generate_content(
+                self,
+                model: str,
+                contents: list,
+                system_instructions: str,
+                thinking_budget: int,
+                schema: BaseModel,
+                hooks: list[Hook],
+                key: str,
+        ) -> Response:
+        from google.genai import types
 
         config = types.GenerateContentConfig(
             thinking_config=types.ThinkingConfig(thinking_budget=thinking_budget),
@@ -44,11 +129,7 @@ class Client:
             response_schema=schema
         )
 
-        response = self.client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=config
-        )
+        response = self._call(model, contents, config, key)
 
         text = response.text
         content = {'text': text}
@@ -56,7 +137,8 @@ class Client:
             model=model,
             content=content,
             input_tokens=response.usage_metadata.prompt_token_count,
-            output_tokens=response.usage_metadata.total_token_count
+            output_tokens=response.usage_metadata.total_token_count,
+            cached_tokens=response.usage_metadata.cached_content_token_count or 0,
         )
 
         if not schema:
@@ -65,18 +147,19 @@ class Client:
         if text.startswith("```json"):
             text = text.replace("```json", "").replace("```", "").strip()
         
+        attempt = 0
         while not self._check_schema(schema, text):
-            response = self.client.models.generate_content(
-                model=model,
-                contents=contents,
-                config=config
-            )
+            attempt += 1
+            for hook in hooks:
+                hook.on_retry(self, model, attempt)
+            response = self._call(model, contents, config, key, retry=attempt)
             text = response.text
             if text.startswith("```json"):
                 text = text.replace("```json", "").replace("```", "").strip()
             
             data.input_tokens += response.usage_metadata.prompt_token_count
             data.output_tokens += response.usage_metadata.total_token_count
+            data.cached_tokens += response.usage_metadata.cached_content_token_count or 0
         
         content = json.loads(text)
         data.content = content
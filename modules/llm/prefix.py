@@ -0,0 +1,133 @@
+# modules/llm/prefix.py
+from collections import deque
+from contextlib import contextmanager
+import hashlib
+import json
+import threading
+import time
+
+
+def prefix_key(model: str, system_instructions: str | None, schema, prefix: list) -> str:
+    """요청의 고정 부분(모델, 시스템 지시, 스키마, 프리픽스 contents)을 식별하는 키"""
+    raw = json.dumps(
+        [model, system_instructions, getattr(schema, "__name__", None), [str(p) for p in prefix]],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# 제공자 측 implicit cache가 유지된다고 보는 시간 (초). 이보다 오래 지난 같은 프리픽스는 hit로 세지 않음
+CACHE_WINDOW_SEC = 60.0
+
+
+class PrefixStats:
+    """프리픽스 hit율과 제공자가 보고한 캐시 토큰 비율을 집계
+
+    prefix hit: 바로 직전에 보낸 요청과 프리픽스가 같고 CACHE_WINDOW_SEC 안에 보낸 호출.
+    스케줄러가 같은 프리픽스를 연달아 보낼수록 올라간다. 실제로 캐시된 양은 cached_token_rate로 확인.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._last_key = None
+            self._last_time = 0.0
+            self.requests = 0
+            self.prefix_hits = 0
+            self.prompt_tokens = 0
+            self.cached_tokens = 0  # 제공자 측 implicit cache로 처리된 입력 토큰 수
+
+    def record_dispatch(self, key: str):
+        """API 호출을 보내는 시점에 기록"""
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            if key == self._last_key and now - self._last_time <= CACHE_WINDOW_SEC:
+                self.prefix_hits += 1
+            self._last_key = key
+            self._last_time = now
+
+    def record_usage(self, prompt_tokens: int, cached_tokens: int):
+        """응답의 usage_metadata 기록"""
+        with self._lock:
+            self.prompt_tokens += prompt_tokens or 0
+            self.cached_tokens += cached_tokens or 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prefix_hits": self.prefix_hits,
+                "prefix_hit_rate": self.prefix_hits / self.requests if self.requests else 0.0,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_token_rate": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            }
+
+
+class _Ticket:
+    __slots__ = ("key", "granted")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.granted = False
+
+
+class PrefixScheduler:
+    """동시 API 호출 수를 제한하고, 대기 중인 요청은 같은 프리픽스끼리 이어서 보냄
+
+    같은 프리픽스 요청이 몰려서 나가야 제공자 측 implicit prefix cache에 맞는다.
+    한 프리픽스가 다른 요청을 굶기지 않도록 연속 max_burst개까지만 이어서 보낸다.
+    슬롯은 _dispatch 한 곳에서만 대기 요청에 넘겨주므로, 깨어난 요청이 순서를 다시 따질 필요가 없다.
+    """
+
+    def __init__(self, max_in_flight: int, max_burst: int = 16):
+        self.max_in_flight = max_in_flight
+        self.max_burst = max_burst
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting: dict[str, deque] = {}  # 프리픽스 키 → 대기 중인 요청 (도착 순)
+        self._last_key = None
+        self._burst = 0
+
+    def _next_key(self) -> str:
+        if self._last_key in self._waiting and self._burst < self.max_burst:
+            return self._last_key
+        # 직전 프리픽스 외에 대기 요청이 가장 많은 프리픽스 (동률이면 먼저 들어온 쪽)
+        others = [k for k in self._waiting if k != self._last_key] or list(self._waiting)
+        return max(others, key=lambda k: len(self._waiting[k]))
+
+    def _dispatch(self):
+        """빈 슬롯을 대기 요청에 넘겨줌 (self._cond를 잡은 상태에서 호출)"""
+        granted = False
+        while self._in_flight < self.max_in_flight and self._waiting:
+            key = self._next_key()
+            ticket = self._waiting[key].popleft()
+            if not self._waiting[key]:
+                del self._waiting[key]
+            self._burst = self._burst + 1 if key == self._last_key else 1
+            self._last_key = key
+            self._in_flight += 1
+            ticket.granted = True
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, key: str):
+        ticket = _Ticket(key)
+        with self._cond:
+            self._waiting.setdefault(key, deque()).append(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                self._cond.wait()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._dispatch()
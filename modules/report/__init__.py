@@ -0,0 +1,2 @@
+﻿# modules/report/__init__.py
+from .digest import ReportDigest, ReportDigester, get_digest, render_digest
@@ -0,0 +1,167 @@
+# modules/report/digest.py
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from pydantic import BaseModel
+
+from modules.agent import Agent
+
+
+class Indicator(BaseModel):
+    name: str  # 예: "50 SMA", "RSI"
+    value: str  # 예: "180.11"
+    signal: str  # 예: "bearish", "neutral"
+
+
+class ReportDigest(BaseModel):
+    """리포트 요약 스키마 - 모든 토론 턴에서 원문 대신 사용"""
+    summary: str
+    key_numbers: list[str]  # 예: "close 161.90 (2025-03-27)"
+    indicators: list[Indicator]
+    signals: list[str]
+
+
+DIGESTER_NAME = "Report Digester"
+DIGEST_MODEL = "gemini-2.5-flash"
+
+
+def _instructions(name: str) -> list[str]:
+    return [  # 모든 리포트에 공통인 지시문
+        f"You are {name}. Compress the report below into a compact digest for analysts who will debate on it.",
+        "Keep every number that matters (prices, indicator values, levels, dates) and drop prose and repetition.",
+        "Return JSON with fields: summary (2-3 sentences), key_numbers (list of short strings), "
+        "indicators (list of {name, value, signal}), signals (list of short strings).",
+    ]
+
+
+@lru_cache
+def digest_version(name: str = DIGESTER_NAME, model: str = DIGEST_MODEL) -> str:
+    """지시문, 스키마, 모델이 바뀌면 달라지는 요약기 버전 (저장된 요약의 캐시 키에 포함)"""
+    raw = json.dumps([_instructions(name), ReportDigest.model_json_schema(), model], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class ReportDigester(Agent):
+    """리포트 원문을 토큰이 적은 구조화된 요약으로 변환하는 에이전트"""
+
+    def __init__(self, name: str = DIGESTER_NAME, model: str = DIGEST_MODEL):
+        super().__init__()
+        self.name = name
+        self.model = model
+
+    @property
+    def version(self) -> str:
+        return digest_version(self.name, self.model)
+
+    def digest(self, report_name: str, text: str) -> dict:
+        resp = self.llm_client.generate_content(
+            model=self.model,
+            contents=[f"[{report_name}]", text],
+            prefix=_instructions(self.name),
+            thinking_budget=self.quick_thinking_budget,
+            schema=ReportDigest,
+        )
+        return resp.content
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def digest_path(report_path: Path) -> Path:
+    return report_path.with_name(f"{report_path.stem}.digest.json")  # market_report.md → market_report.digest.json
+
+
+def _read_stored(path: Path) -> dict:
+    """저장된 요약 파일을 읽음. 없거나 깨진 파일은 캐시 미스로 취급"""
+    try:
+        stored = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return stored if isinstance(stored, dict) else {}
+
+
+def _write_atomic(path: Path, text: str):
+    """임시 파일에 쓴 뒤 교체해서, 쓰다 만 파일이 남지 않도록 함"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+_memo: dict[str, dict] = {}  # (요약기 버전 + 리포트) 해시 → 요약 (같은 프로세스의 다른 실행과 공유)
+_hash_locks: dict[str, threading.Lock] = {}  # 같은 리포트를 동시에 여러 번 요약하지 않도록
+_memo_lock = threading.Lock()
+
+
+def _store(path: Path, h: str, version: str, source: str, digest: dict):
+    _write_atomic(
+        path,
+        json.dumps({"hash": h, "version": version, "source": source, "digest": digest}, ensure_ascii=False, indent=2),
+    )
+
+
+def get_digest(report_path: Path, text: str = None, digester: ReportDigester = None) -> dict:
+    """리포트 버전(내용 해시)과 요약기 버전별로 한 번만 요약을 만들고, 리포트 옆 <이름>.digest.json에 저장해 재사용"""
+    report_path = Path(report_path)
+    text = report_path.read_text(encoding="utf-8") if text is None else text
+    version = digester.version if digester else digest_version()
+    h = content_hash(f"{version}\n{text}")
+    path = digest_path(report_path)
+
+    with _memo_lock:
+        digest = _memo.get(h)
+        if digest is None:
+            lock = _hash_locks.setdefault(h, threading.Lock())
+
+    if digest is not None:
+        # 내용이 같은 다른 경로의 리포트도 자기 옆에 요약 파일을 갖도록
+        if _read_stored(path).get("hash") != h:
+            _store(path, h, version, report_path.name, digest)
+        return digest
+
+    with lock:  # 먼저 들어온 작업이 요약을 만드는 동안 나머지는 대기 후 결과 재사용
+        with _memo_lock:
+            digest = _memo.get(h)
+        if digest is None:
+            stored = _read_stored(path)
+            if stored.get("hash") == h and isinstance(stored.get("digest"), dict):  # 리포트/요약기가 그대로면 저장된 요약 사용
+                digest = stored["digest"]
+            else:
+                digest = (digester or ReportDigester()).digest(report_path.stem, text)
+                _store(path, h, version, report_path.name, digest)
+        elif _read_stored(path).get("hash") != h:
+            _store(path, h, version, report_path.name, digest)
+
+        with _memo_lock:
+            _memo[h] = digest
+            _hash_locks.pop(h, None)  # 이후 호출은 _memo에서 바로 반환되므로 잠금 불필요
+        return digest
+
+
+def render_digest(digest: dict) -> str:
+    """요약을 프롬프트에 넣을 짧은 텍스트로 변환"""
+    lines = [f"(digest) {digest.get('summary', '')}"]
+    if digest.get("key_numbers"):
+        lines.append("Key numbers: " + "; ".join(digest["key_numbers"]))
+    if digest.get("indicators"):
+        lines.append("| indicator | value | signal |")
+        lines += [f"| {i.get('name', '')} | {i.get('value', '')} | {i.get('signal', '')} |" for i in digest["indicators"]]
+    if digest.get("signals"):
+        lines.append("Signals: " + "; ".join(digest["signals"]))
+    return "\n".join(lines)
+
+
+# Test: python -m modules.report.digest
+if __name__ == "__main__":
+    rp = Path("results/GOOGL/2025-03-28/reports/market_report.md")
+    print(render_digest(get_digest(rp)))
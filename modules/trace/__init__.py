@@ -0,0 +1,3 @@
+﻿# modules/trace/__init__.py
+from .hooks import Hook, add_hook, remove_hook, get_hooks, span
+from .tracer import ChromeTracer
@@ -0,0 +1,69 @@
+# modules/trace/hooks.py
+from contextlib import contextmanager
+import threading
+
+
+class Hook:
+    """그래프 실행 중 호출되는 훅. 필요한 메서드만 오버라이드해서 사용"""
+
+    def before_node(self, node, context):
+        pass
+
+    def after_node(self, node, context):
+        pass
+
+    def before_llm(self, client, model: str, contents: list):
+        pass
+
+    def after_llm(self, client, model: str, response):
+        # 호출이 예외로 끝나면 response는 None
+        pass
+
+    def on_retry(self, client, model: str, attempt: int):
+        pass
+
+    def before_span(self, name: str, args: dict):
+        pass
+
+    def after_span(self, name: str, args: dict):
+        pass
+
+
+_global_hooks: list[Hook] = []  # 모든 Graph/Client에 적용되는 훅
+_lock = threading.Lock()
+
+
+def add_hook(hook: Hook):
+    with _lock:
+        _global_hooks.append(hook)
+
+
+def remove_hook(hook: Hook):
+    with _lock:
+        if hook in _global_hooks:
+            _global_hooks.remove(hook)
+
+
+def get_hooks(*local_hooks: list[Hook]) -> list[Hook]:
+    """전역 훅 + 인스턴스(Graph/BaseNode/Client)에 등록된 훅"""
+    hooks = list(_global_hooks)
+    for hs in local_hooks:
+        hooks.extend(hs)
+    return hooks
+
+
+@contextmanager
+def span(name: str, **args):
+    """임의 구간(프롬프트 구성, 로그 저장 등)을 훅에 알리는 컨텍스트 매니저"""
+    hooks = get_hooks()
+    if not hooks:  # 훅이 없으면 오버헤드 없이 통과
+        yield
+        return
+
+    for hook in hooks:
+        hook.before_span(name, args)
+    try:
+        yield
+    finally:
+        for hook in hooks:
+            hook.after_span(name, args)
@@ -0,0 +1,133 @@
+# modules/trace/tracer.py
+from pathlib import Path
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from .hooks import Hook, add_hook, remove_hook
+
+
+class ChromeTracer(Hook):
+    """실행 타임라인을 Chrome trace-event JSON으로 기록 (chrome://tracing, Perfetto에서 열기)
+
+    이벤트는 메모리에 쌓지 않고 도착하는 대로 JSON 배열 형식으로 파일에 이어 쓴다.
+    프로세스가 중간에 죽어 닫는 ']'가 없어도 Chrome/Perfetto에서 열 수 있다.
+
+    memory=True면 tracemalloc으로 노드별 메모리 증가량과 할당이 많이 늘어난 위치를 함께 기록한다.
+    tracemalloc은 프로세스 전체를 보므로 노드가 동시에 실행되면 서로의 할당이 섞인다.
+
+    with ChromeTracer("logs/traces/run.json"):
+        graph.run(context)
+    """
+
+    def __init__(self, path: str | Path, memory: bool = False, top_allocs: int = 5):
+        self.path = Path(path)
+        self.memory = memory
+        self.top_allocs = top_allocs
+
+        self.event_count = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 스레드별 노드 시작 시점의 tracemalloc 스냅샷
+        self._pid = os.getpid()
+        self._t0 = time.perf_counter()
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self._file.write("[")
+        self._file.flush()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        add_hook(self)
+
+    def stop(self):
+        remove_hook(self)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        with self._lock:
+            if self._file is not None:
+                self._file.write("\n]\n")
+                self._file.close()
+                self._file = None
+
+    def _emit(self, ph: str, name: str, cat: str, **args):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": ph,  # 'B': 시작, 'E': 끝, 'i': 순간, 'C': 카운터
+            "ts": (time.perf_counter() - self._t0) * 1e6,  # 마이크로초
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if ph == "i":
+            event["s"] = "t"
+        if args:
+            event["args"] = args
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:  # stop 이후에 끝난 구간
+                return
+            self._file.write(("\n" if self.event_count == 0 else ",\n") + line)
+            self._file.flush()  # 프로세스가 죽어도 여기까지의 타임라인은 남음
+            self.event_count += 1
+
+    # 노드
+    def before_node(self, node, context):
+        if self.memory:
+            self._local.snapshot = tracemalloc.take_snapshot()
+        self._emit("B", node.name, "node", ticker=context.get_cache("ticker"), trade_date=context.get_cache("trade_date"))
+
+    def after_node(self, node, context):
+        args = {"state": node.state}
+        if self.memory:
+            args.update(self._memory_diff())
+            current, peak = tracemalloc.get_traced_memory()
+            self._emit("C", "memory", "memory", current_kb=current / 1024, peak_kb=peak / 1024)
+        self._emit("E", node.name, "node", **args)
+
+    def _memory_diff(self) -> dict:
+        before = getattr(self._local, "snapshot", None)
+        if before is None:
+            return {}
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)  # tracemalloc 자체 할당 제외
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        stats = after.compare_to(before.filter_traces(ignore), "lineno")
+        self._local.snapshot = None
+        return {
+            "alloc_growth_kb": sum(s.size_diff for s in stats) / 1024,
+            "top_allocs": [f"{s.traceback[0].filename}:{s.traceback[0].lineno} {s.size_diff / 1024:+.1f}KB" for s in stats[:self.top_allocs]],
+        }
+
+    # LLM 호출
+    def before_llm(self, client, model: str, contents: list):
+        self._emit("B", f"llm {model}", "llm", chars=sum(len(str(c)) for c in contents))
+
+    def after_llm(self, client, model: str, response):
+        if response is None:  # 호출 실패
+            self._emit("E", f"llm {model}", "llm", error=True)
+        else:
+            self._emit("E", f"llm {model}", "llm", input_tokens=response.input_tokens, output_tokens=response.output_tokens)
+
+    def on_retry(self, client, model: str, attempt: int):
+        self._emit("i", "schema retry", "llm", model=model, attempt=attempt)
+
+    # 임의 구간
+    def before_span(self, name: str, args: dict):
+        self._emit("B", name, "span", **args)
+
+    def after_span(self, name: str, args: dict):
+        self._emit("E", name, "span")
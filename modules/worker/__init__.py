@@ -0,0 +1,3 @@
+﻿# modules/worker/__init__.py
+from .job_queue import JobQueue, WorkerLockedError
+from .worker import Worker
@@ -0,0 +1,203 @@
+# modules/worker/job_queue.py
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+import os
+import sqlite3
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_DB_PATH = Path("jobs/queue.db")  # 작업 큐 SQLite 파일
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    graph TEXT NOT NULL,
+    ticker TEXT,
+    trade_date TEXT,
+    params TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',  -- 'queued', 'running', 'done', 'failed'
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    result TEXT,
+    error TEXT,
+    not_before TEXT,  -- 재시도 대기: 이 시각 이후에만 claim
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+"""
+
+
+class WorkerLockedError(RuntimeError):
+    """같은 DB 파일에 이미 다른 워커가 붙어 있음"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+class JobQueue:
+    """SQLite 기반의 로컬 영속 작업 큐 (프로세스가 죽어도 작업이 남음)"""
+
+    def __init__(self, path: str | Path = DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()  # 워커 스레드들이 하나의 커넥션을 공유
+        self._worker_lock_fd = None  # <db>.lock 파일 (워커 한 프로세스만 보유)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")  # enqueue 프로세스와 워커가 동시에 접근 가능
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """이전 버전에서 만든 DB에 없는 컬럼 추가"""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "not_before" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN not_before TEXT")
+
+    def close(self):
+        self.release_worker_lock()
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def _in_memory(self) -> bool:
+        return str(self.path) == ":memory:"
+
+    def acquire_worker_lock(self):
+        """<db>.lock 파일에 배타 잠금. 다른 워커가 잡고 있으면 WorkerLockedError
+
+        워커는 시작 시 'running' 작업을 회수하므로, 두 번째 워커가 첫 워커의 작업을 빼앗지 않도록 한다.
+        잠금은 프로세스가 죽으면 OS가 풀어준다.
+        """
+        if self._in_memory or self._worker_lock_fd is not None:
+            return
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            raise WorkerLockedError(f"다른 워커가 이미 이 작업 큐를 사용 중입니다.: {self.path}")
+        self._worker_lock_fd = fd
+
+    def release_worker_lock(self):
+        if self._worker_lock_fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._worker_lock_fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._worker_lock_fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._worker_lock_fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._worker_lock_fd)
+        self._worker_lock_fd = None
+
+    def _row(self, row: sqlite3.Row | None) -> dict | None:
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+
+    def enqueue(self, graph: str, ticker: str = None, trade_date: str = None, params: dict = None, max_attempts: int = 3) -> int:
+        now = _now()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO jobs (graph, ticker, trade_date, params, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (graph, ticker, trade_date, json.dumps(params or {}, ensure_ascii=False), max_attempts, now, now),
+            )
+            return cur.lastrowid
+
+    def claim(self) -> dict | None:
+        """재시도 대기 시간이 지난 가장 오래된 'queued' 작업 하나를 'running'으로 바꾸고 반환 (없으면 None)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")  # 다른 워커 프로세스와 같은 작업을 가져가지 않도록 잠금
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' AND attempts < max_attempts "
+                    "AND (not_before IS NULL OR not_before <= ?) ORDER BY id LIMIT 1",
+                    (_now(),),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (_now(), row["id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        job = self._row(row)
+        if job is not None:
+            job["status"] = "running"
+            job["attempts"] += 1
+        return job
+
+    def complete(self, job_id: int, result: dict):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result, ensure_ascii=False, default=str), _now(), job_id),
+            )
+
+    def fail(self, job_id: int, error: str, retryable: bool = True, retry_delay: float = 0) -> str:
+        """실패 기록. 재시도 가능하고 횟수가 남았으면 retry_delay초 뒤에 다시 'queued'로,
+        아니면 'failed'로 바꾸고 새 상태를 반환"""
+        now = datetime.now()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN ? AND attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+                "error = ?, not_before = ?, updated_at = ? WHERE id = ?",
+                (retryable, error, (now + timedelta(seconds=retry_delay)).isoformat(), now.isoformat(), job_id),
+            )
+            return self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()["status"]
+
+    def release(self, job_id: int):
+        """실행하지 못한 작업을 시도 횟수를 되돌리고 다시 'queued'로"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = attempts - 1, updated_at = ? WHERE id = ? AND status = 'running'",
+                (_now(), job_id),
+            )
+
+    def requeue_stale(self) -> tuple[int, int]:
+        """이전 워커가 비정상 종료하면서 남긴 'running' 작업 회수 (워커 시작 시 호출)
+
+        재시도 횟수가 남은 작업은 'queued'로, 다 쓴 작업은 'failed'로 바꾸고 (회수, 실패) 개수를 반환.
+        워커 프로세스 자체를 죽이는 작업(OOM 등)이 재시작마다 무한히 다시 실행되지 않도록 한다.
+        """
+        now = _now()
+        with self._lock:
+            failed = self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+                "WHERE status = 'running' AND attempts >= max_attempts",
+                ("worker가 작업 도중 종료됨 (재시도 횟수 초과)", now),
+            ).rowcount
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = 'running'",
+                (now,),
+            ).rowcount
+        return requeued, failed
+
+    def get(self, job_id: int) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(row)
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
@@ -0,0 +1,156 @@
+# modules/worker/worker.py
+import signal
+import threading
+import traceback
+
+from graphs.registry import UnknownGraphError, create_graph, create_context, graph_params
+from .job_queue import JobQueue
+
+# 다시 실행해도 같은 결과가 나오는 오류 (잘못된 그래프 이름, 없는 리포트, 잘못된 파라미터) → 첫 실패에 'failed'
+NON_RETRYABLE_ERRORS = (UnknownGraphError, FileNotFoundError, TypeError)
+
+
+class Worker:
+    """JobQueue에서 작업을 가져와 그래프를 실행하는 상주 워커
+
+    LLM 클라이언트와 생성된 그래프를 메모리에 유지해서 작업마다 다시 만들지 않는다.
+    시작 시 'running' 작업을 회수하므로 한 DB 파일에는 워커 하나만 붙을 수 있다 (<db>.lock 배타 잠금으로 강제).
+    """
+
+    def __init__(self, queue: JobQueue, concurrency: int = 4, poll_interval: float = 1.0, retry_delay: float = 30.0):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay  # 재시도 대기 시간 (초), 시도마다 2배씩 증가
+
+        self._graphs: dict[tuple, list] = {}  # (그래프 이름, 구조 인자) → 쉬고 있는 그래프 목록
+        self._graphs_lock = threading.Lock()
+        self._draining = threading.Event()  # 새 작업을 받지 않고 진행 중인 작업만 마무리
+        self._stopping = threading.Event()  # 즉시 종료
+        self._wake = threading.Event()  # 작업 종료/시그널 시 run 루프를 깨움
+        self._in_flight: dict[int, dict] = {}  # job id → 실행 중인 작업
+        self._in_flight_lock = threading.Lock()
+        self._record_lock = threading.Lock()  # 결과 기록과 즉시 종료가 겹치지 않도록
+
+    # 그래프 풀: 노드가 실행 상태를 들고 있으므로 같은 그래프를 동시에 두 작업이 쓰지 않도록 빌려주고 돌려받음
+    def _checkout(self, name: str, params: dict):
+        key = (name, tuple(sorted(graph_params(name, params).items())))
+        with self._graphs_lock:
+            idle = self._graphs.setdefault(key, [])
+            if idle:
+                return key, idle.pop()
+        return key, create_graph(name, **params)
+
+    def _checkin(self, key: tuple, graph):
+        with self._graphs_lock:
+            self._graphs[key].append(graph)
+
+    def _process(self, job: dict):
+        params = dict(job["params"])
+        if job["ticker"]:
+            params["ticker"] = job["ticker"]
+        if job["trade_date"]:
+            params["trade_date"] = job["trade_date"]
+
+        try:
+            error = None
+            try:
+                context = create_context(job["graph"], **params)  # 리포트가 없으면 그래프/클라이언트 생성 전에 실패
+                key, graph = self._checkout(job["graph"], params)
+                try:
+                    context = graph.run(context)
+                finally:
+                    self._checkin(key, graph)
+            except Exception as e:
+                error = e
+
+            # 즉시 종료가 시작된 뒤에는 기록하지 않음 (종료 시 release된 작업은 다음 워커가 다시 실행)
+            with self._record_lock:
+                if self._stopping.is_set():
+                    return
+                if error is None:
+                    self.queue.complete(job["id"], context.cache)
+                else:
+                    status = self.queue.fail(
+                        job["id"],
+                        "".join(traceback.format_exception(error)),
+                        retryable=not isinstance(error, NON_RETRYABLE_ERRORS),
+                        retry_delay=self.retry_delay * 2 ** (job["attempts"] - 1),
+                    )
+
+            if error is None:
+                print(f"[Worker] job {job['id']} 완료: {job['graph']} {job['ticker']} {job['trade_date']}")
+            else:
+                print(f"[Worker] job {job['id']} 실패 ({status}): {error}")
+        except Exception as e:  # 기록 중 오류도 스레드 안에서 사라지지 않도록 출력
+            print(f"[Worker] job {job['id']} 기록 실패: {e}")
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(job["id"], None)
+            self._wake.set()
+
+    def drain(self, *_):
+        """새 작업을 받지 않고, 진행 중인 작업이 끝나면 종료 (두 번째 호출 시 즉시 종료)"""
+        if self._draining.is_set():
+            self._stopping.set()
+            print("[Worker] 즉시 종료: 진행 중인 작업은 대기열로 되돌립니다.")
+        else:
+            self._draining.set()
+            print("[Worker] drain 시작: 진행 중인 작업을 마무리합니다.")
+        self._wake.set()
+
+    def run(self, until_empty: bool = False):
+        """until_empty=True면 큐가 비고 진행 중인 작업이 모두 끝났을 때 종료 (batch 실행용)"""
+        self.queue.acquire_worker_lock()  # 다른 워커가 있으면 WorkerLockedError
+        previous = {}
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                previous[sig] = signal.signal(sig, self.drain)
+        try:
+            self._run(until_empty)
+        finally:
+            for sig, handler in previous.items():  # run이 끝나면 Ctrl+C가 다시 프로세스를 중단하도록 복원
+                signal.signal(sig, handler)
+            self.queue.release_worker_lock()
+
+    def _run(self, until_empty: bool):
+        recovered, exhausted = self.queue.requeue_stale()
+        if recovered:
+            print(f"[Worker] 중단됐던 작업 {recovered}개를 다시 대기열에 넣었습니다.")
+        if exhausted:
+            print(f"[Worker] 재시도 횟수를 다 쓴 중단 작업 {exhausted}개를 실패 처리했습니다.")
+
+        while not self._stopping.is_set():
+            self._wake.clear()
+
+            # 1. 여유가 있는 만큼 작업 가져오기
+            empty = False
+            while not self._draining.is_set() and len(self._in_flight) < self.concurrency:
+                job = self.queue.claim()
+                if job is None:
+                    empty = True
+                    break
+                with self._in_flight_lock:
+                    self._in_flight[job["id"]] = job
+                # 데몬 스레드: 즉시 종료 시 프로세스가 진행 중인 작업을 기다리지 않음
+                threading.Thread(target=self._process, args=(job,), name=f"job-{job['id']}", daemon=True).start()
+
+            if not self._in_flight:
+                if self._draining.is_set():
+                    break
+                # 재시도 대기 중인 작업이 남아 있으면 until_empty여도 기다림
+                if until_empty and empty and not self.queue.counts().get("queued"):
+                    break
+
+            # 2. 작업 하나가 끝나거나, 시그널이 오거나, poll_interval이 지날 때까지 대기
+            self._wake.wait(self.poll_interval)
+
+        # 즉시 종료: 이후로는 결과를 기록하지 않고, 진행 중인 작업은 시도 횟수를 되돌려 대기열로
+        with self._record_lock:
+            self._stopping.set()
+            with self._in_flight_lock:
+                interrupted = list(self._in_flight)
+            for job_id in interrupted:
+                self.queue.release(job_id)
+
+        print(f"[Worker] 종료: {self.queue.counts()}")